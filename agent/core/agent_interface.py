@@ -1,4 +1,4 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional
 import logging
 from agent.memory.memory_system import MemorySystem
 from agent.memory.memory_state import AgentState
@@ -14,8 +14,11 @@ from agent.core.outline_chain import create_outline_chain
 from agent.core.result_composer import ResultComposer
 from agent.core.performance_monitoring import PerformanceMonitor
 from agent.core.category_matcher import CategoryMatcher
-from rag_pipeline.rag_pipeline import double_retrieve, rag_pipeline
+from rag_pipeline.rag_pipeline import batch_double_retrieve, rag_pipeline
 from langchain_openai import ChatOpenAI
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import hashlib
 import json
 
 
@@ -24,6 +27,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# 대화 분석 결과 캐시 크기 (같은 대화/프로젝트 정보에 대해서는 LLM을 다시 호출하지 않음)
+ANALYSIS_CACHE_SIZE = 32
+
 class AgentInterface:
     """
     에이전트 인터페이스
@@ -44,6 +50,7 @@ class AgentInterface:
         self.result_composer = ResultComposer()
         self.performance_monitor = PerformanceMonitor()
         self.llm = ChatOpenAI()
+        self._analysis_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
         
         # Initialize conversation state
         self.conversation_state = {
@@ -90,26 +97,37 @@ class AgentInterface:
             {project_info}
             """
             
-            # Use the purpose chain to analyze the conversation
-            analysis_result = self.purpose_chain.invoke({
-                "request": analysis_prompt,
-                "context": project_info.get("additional_context", [])
-            })
-            
-            # Handle the response based on its type
-            if hasattr(analysis_result, 'function_call') and analysis_result.function_call:
-                # If it's a function call response, parse the arguments
-                print("json.loads")
-                result_data = json.loads(analysis_result.function_call.arguments)
-            elif hasattr(analysis_result, 'model_dump'):
-                # If it's a Pydantic model, convert to dict
-                print("model_dump")
-                result_data = analysis_result.model_dump()
+            # 프롬프트에 전체 대화와 프로젝트 정보가 모두 포함되므로 프롬프트 해시를 캐시 키로 사용
+            cache_key = hashlib.blake2b(analysis_prompt.encode("utf-8"), digest_size=16).digest()
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                result_data, result_dic = cached
             else:
-                # If it's already a dict, use it as is
-                print("dict")
-                result_data = analysis_result
-            result_dic=json.loads(result_data.get("additional_kwargs", {}).get("function_call", {}).get("arguments", {}).replace("\n", ' '))
+                # Use the purpose chain to analyze the conversation
+                analysis_result = self.purpose_chain.invoke({
+                    "request": analysis_prompt,
+                    "context": project_info.get("additional_context", [])
+                })
+                
+                # Handle the response based on its type
+                if hasattr(analysis_result, 'function_call') and analysis_result.function_call:
+                    # If it's a function call response, parse the arguments
+                    logger.debug("analysis result parsed from function_call arguments")
+                    result_data = json.loads(analysis_result.function_call.arguments)
+                elif hasattr(analysis_result, 'model_dump'):
+                    # If it's a Pydantic model, convert to dict
+                    logger.debug("analysis result converted with model_dump")
+                    result_data = analysis_result.model_dump()
+                else:
+                    # If it's already a dict, use it as is
+                    logger.debug("analysis result used as dict")
+                    result_data = analysis_result
+                result_dic=json.loads(result_data.get("additional_kwargs", {}).get("function_call", {}).get("arguments", {}).replace("\n", ' '))
+                
+                self._analysis_cache[cache_key] = (result_data, result_dic)
+                if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
             # Update conversation state using the result data
             self.conversation_state.update({
                 "current_topic": result_dic.get("next_topic", ""),
@@ -125,7 +143,7 @@ class AgentInterface:
                 "state": self.conversation_state,
                 "result_data": result_data
             })
-            print('\n\n',result_dic,'\n\n')
+            logger.debug("conversation analysis: %s", result_dic)
             return {
                 "next_topic": result_dic.get("next_topic", ""),
                 "conversation_context": result_dic.get("conversation_context", ""),
@@ -192,7 +210,7 @@ class AgentInterface:
             3. 사용자의 이전 답변을 참조하여 구체적인 후속 질문 생성
             4. 대화가 자연스럽게 흐르도록 구성
             """
-            print(question_prompt)
+            logger.debug("question prompt: %s", question_prompt)
             # Use the purpose chain to generate the question
             question_result = self.purpose_chain.invoke({
                 "request": question_prompt,
@@ -212,7 +230,7 @@ class AgentInterface:
             # Update conversation state
             self.conversation_state["last_question"] = self.conversation_state["question"]
             self.conversation_state["follow_up_count"] += 1
-            print('\n\n',result_dic,'\n\n')
+            logger.debug("question generation: %s", result_dic)
             # Store in memory system using add_interaction
             self.memory.add_interaction({
                 "type": "question_generation",
@@ -226,12 +244,14 @@ class AgentInterface:
             # End performance monitoring
             self.performance_monitor.end_operation("question_generation")
 
-    def generate_outline(self, project_info: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_outline(self, project_info: Dict[str, Any],
+                         on_section: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         프로젝트 정보를 기반으로 RFP 개요를 생성합니다.
         
         Args:
             project_info (Dict): 프로젝트 정보
+            on_section (Callable, optional): 섹션 HTML이 완성될 때마다 순서대로 호출되는 콜백
             
         Returns:
             Dict: 생성된 RFP 개요
@@ -249,48 +269,59 @@ class AgentInterface:
             # Prepare project description for RAG
             project_description = f"{combined_info.get('project_name', '')} - {combined_info.get('goal', '')} - {combined_info.get('additional_context', '')}"
             
+            # 섹션별 검색 키워드와 생성 질의
+            sections = [
+                (""" '범위', '규모', '기간', '대상', 'scope', 'scale', 'timeline',
+                    '예산', '비용', '금액', '재정', 'budget', 'cost', 'financial',
+                    '인력', '자원', '리소스', 'resource', 'manpower', 'staff'""", "금액, 예산, 인력, 규모, 기간, 대상, 범위 등을 소개해 주세요요"),
+                ("""'사례', '예시', '참고', '벤치마크', 'case', 'example', 'reference',
+                    '표준', '기준', '업계', '시장', 'standard', 'industry', 'market',
+                    '방법론', '기술', '접근', 'methodology', 'technology', 'approach'""", '사례, 예시, 참고, 벤치마크, 기준, 업계, 시장, 기술, 접근 등을 소개해 주세요'),
+                ("""'평가', '기준', '지표', '점수', 'evaluation', 'criteria', 'metrics',
+                    '정성', '질적', '주관', 'qualitative', 'subjective', 'quality',
+                    '산출물', '결과물', '성과물', 'deliverable', 'output', 'result'""", '평가 기준, 배점, 결과물의 형식, 점수 지표 등을 정해주세요'),
+                # Generate tasks with RAG context
+                (" 요구사항, 요청사항을 작성해주세요", project_description),
+            ]
+            
             # 주어진 쿼리와 관련된 문서를 검색
-            rag_context = double_retrieve(project_description+"""목적', '목표', '배경', '필요성', 'why', 'purpose', 'objective',
+            # 전체 컨텍스트용 검색과 섹션별 검색을 한 번의 배치로 처리 (임베딩 API 호출 1회)
+            rag_context, *section_docs = batch_double_retrieve([project_description+"""목적', '목표', '배경', '필요성', 'why', 'purpose', 'objective',
                     '기대효과', '기대', '성과', '효과', 'outcome', 'impact', 'benefit',
                     '문제', '현황', '상황', 'problem', 'status', 'situation'
                     '목적', '목표', '배경', '필요성', 'why', 'purpose', 'objective',
                     '기대효과', '기대', '성과', '효과', 'outcome', 'impact', 'benefit',
-                    '문제', '현황', '상황', 'problem', 'status', 'situation'" "범위 정의""")
+                    '문제', '현황', '상황', 'problem', 'status', 'situation'" "범위 정의"""] + [
+                project_description + keywords for keywords, _ in sections
+            ])
             
             # Match categories
             set_of_categories = self.category_matcher.match_task_to_categories({"description": project_description})
             categories = [category['category_id'] for category in set_of_categories][:3]
             
             # Combine all context
-            full_context = combined_info.get("additional_context", [])
+            # 호출자의 project_info가 변경되지 않도록 복사본에 추가
+            full_context = list(combined_info.get("additional_context", []))
             if rag_context:
                 full_context.append(f"관련 사례 및 참고 정보: {rag_context}")
             # 기능별로 html을 반환하는 AI를 사용하고 그 결과를 합함.
-            # Generate purpose analysis with RAG context
-            purpose_result = rag_pipeline(full_context, "목적 및 배경을 소개해주세요")
-            full_context = combined_info.get("additional_context", [])
-            scope_result = rag_pipeline(context=(full_context+ [doc.page_content for doc in double_retrieve(project_description+
-                    """ '범위', '규모', '기간', '대상', 'scope', 'scale', 'timeline',
-                    '예산', '비용', '금액', '재정', 'budget', 'cost', 'financial',
-                    '인력', '자원', '리소스', 'resource', 'manpower', 'staff'""")]), query="금액, 예산, 인력, 규모, 기간, 대상, 범위 등을 소개해 주세요요")
-            full_context = combined_info.get("additional_context", [])
-            case_result = rag_pipeline(full_context+ [doc.page_content for doc in double_retrieve(project_description+
-                    """'사례', '예시', '참고', '벤치마크', 'case', 'example', 'reference',
-                    '표준', '기준', '업계', '시장', 'standard', 'industry', 'market',
-                    '방법론', '기술', '접근', 'methodology', 'technology', 'approach'""")], query='사례, 예시, 참고, 벤치마크, 기준, 업계, 시장, 기술, 접근 등을 소개해 주세요')
-            full_context = combined_info.get("additional_context", [])
-            eval_result = rag_pipeline(full_context+ [doc.page_content for doc in double_retrieve(project_description+
-                    """'평가', '기준', '지표', '점수', 'evaluation', 'criteria', 'metrics',
-                    '정성', '질적', '주관', 'qualitative', 'subjective', 'quality',
-                    '산출물', '결과물', '성과물', 'deliverable', 'output', 'result'""")], query='평가 기준, 배점, 결과물의 형식, 점수 지표 등을 정해주세요')
-            # Generate tasks with RAG context
-            full_context = combined_info.get("additional_context", [])
-            
+            # 각 섹션 생성은 서로 독립적인 LLM 호출이므로 동시에 실행하여 대기 시간을 줄임
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                # Generate purpose analysis with RAG context
+                futures = [executor.submit(rag_pipeline, full_context, "목적 및 배경을 소개해주세요")]
+                futures += [
+                    executor.submit(rag_pipeline, full_context + [doc.page_content for doc in docs], query)
+                    for (_, query), docs in zip(sections, section_docs)
+                ]
+                # 앞 섹션부터 완성되는 대로 전달하여 화면이 전체 생성을 기다리지 않도록 함
+                section_results = []
+                for future in futures:
+                    section_results.append(future.result())
+                    if on_section is not None:
+                        on_section(section_results[-1])
             
-            task_result = rag_pipeline(full_context+ [doc.page_content for doc in double_retrieve(project_description+" 요구사항, 요청사항을 작성해주세요")], query=project_description)
-            # Generate outline using outline chain            
             # Compose final result
-            final_result = purpose_result+'\n\n'+scope_result+'\n\n'+case_result+'\n\n'+eval_result+'\n\n'+task_result
+            final_result = '\n\n'.join(section_results)
             
             return {
                 "status": "success",
@@ -314,4 +345,4 @@ class AgentInterface:
             # End performance monitoring
             self.performance_monitor.end_operation("outline_generation") 
 
-print("agent_interface.py 실행완료")
\ No newline at end of file
+logger.debug("agent_interface.py 실행완료")
\ No newline at end of file
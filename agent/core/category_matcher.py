@@ -58,6 +58,19 @@ class CategoryMatcher:
             }
         }
         
+        # 키워드는 소문자 frozenset으로 미리 변환 (한국어 복합어 매칭을 위해 부분 문자열 비교는 유지)
+        self._keyword_sets = {
+            category: frozenset(keyword.lower() for keyword in config['keywords'])
+            for category, config in self.categories.items()
+        }
+        
+        # 패턴 정규식은 호출마다 컴파일/캐시 조회하지 않도록 미리 컴파일
+        # (점수는 일치한 패턴 개수이므로 하나의 alternation으로 합치지 않음)
+        self._compiled_patterns = {
+            category: tuple(re.compile(pattern) for pattern in config['patterns'])
+            for category, config in self.categories.items()
+        }
+        
         # TF-IDF 벡터화기 초기화
         self.vectorizer = TfidfVectorizer(
             max_features=1000,
@@ -91,15 +104,15 @@ class CategoryMatcher:
 
     def _calculate_keyword_score(self, text: str, category: str) -> float:
         """키워드 기반 점수 계산"""
-        keywords = self.categories[category]['keywords']
+        keywords = self._keyword_sets[category]
         text = text.lower()
-        matches = sum(1 for keyword in keywords if keyword.lower() in text)
-        return min(matches / len(keywords), 1.0)
+        matches = sum(1 for keyword in keywords if keyword in text)
+        return min(matches / len(self.categories[category]['keywords']), 1.0)
 
     def _calculate_pattern_score(self, text: str, category: str) -> float:
         """패턴 매칭 점수 계산"""
-        patterns = self.categories[category]['patterns']
-        matches = sum(1 for pattern in patterns if re.search(pattern, text))
+        patterns = self._compiled_patterns[category]
+        matches = sum(1 for pattern in patterns if pattern.search(text))
         return min(matches / len(patterns), 1.0)
 
     def calculate_category_score(self, task_text: str, category: str) -> float:
@@ -234,7 +234,19 @@ class OutlineGenerator:
         except KeyError:
             return section_id.replace('_', ' ').title()
 
-    def _generate_section_outline(self, section: Dict, tasks: List[Dict], category: str) -> Dict:
+    def _build_category_index(self, tasks: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        카테고리별 작업 역색인 생성
+        섹션마다 전체 작업을 다시 훑지 않도록 카테고리 -> 작업 목록을 한 번에 구성합니다.
+        """
+        index = {}
+        for task in tasks:
+            for category in task.get('categories', ()):
+                index.setdefault(category, []).append(task)
+        return index
+
+    def _generate_section_outline(self, section: Dict, tasks: List[Dict], category: str,
+                                  category_index: Optional[Dict[str, List[Dict]]] = None) -> Dict:
         """
         섹션별 개요 생성
         각 섹션의 구조, 관련 작업, 예시 등을 포함한 개요를 생성합니다.
@@ -243,7 +255,9 @@ class OutlineGenerator:
         subsections = self._get_section_template(section['id'])
         
         # 관련 작업 필터링
-        relevant_tasks = [t for t in tasks if section['id'] in t.get('categories', [])]
+        if category_index is None:
+            category_index = self._build_category_index(tasks)
+        relevant_tasks = category_index.get(section['id'], [])
         
         # RAG 예시 검색
         rag_examples = self._get_rag_examples(section['id'], category)
@@ -297,26 +311,31 @@ class OutlineGenerator:
             outline = {
                 'category': primary_category,
                 'language': 'ko',
-                'sections': [],
-                'metadata': self.metadata_template.copy()
+                'sections': []
             }
             
-            # 각 섹션에 대한 개요 생성
+            # 각 섹션에 대한 개요 생성 (카테고리 역색인은 한 번만 구성)
+            category_index = self._build_category_index(tasks)
             for section in sections:
-                section_outline = self._generate_section_outline(section, tasks, primary_category)
+                section_outline = self._generate_section_outline(section, tasks, primary_category, category_index)
                 outline['sections'].append(section_outline)
             
             # 관련성 점수로 섹션 정렬
             outline['sections'].sort(key=lambda x: x['relevance'], reverse=True)
             
             # ResultComposer 통합을 위한 메타데이터 추가
-            outline['metadata'].update({
+            # 템플릿을 복사한 뒤 덮어쓰지 않고 최종 메타데이터를 한 번에 구성
+            outline['metadata'] = {
+                'version': self.metadata_template['version'],
+                'language': self.metadata_template['language'],
+                'generated_by': self.metadata_template['generated_by'],
+                'last_modified': None,  # ResultComposer에서 설정
+                'sections': self.metadata_template['sections'],
                 'primary_category': primary_category,
                 'section_count': len(outline['sections']),
                 'generated_at': None,  # ResultComposer에서 설정
-                'last_modified': None,  # ResultComposer에서 설정
                 'status': 'draft'  # ResultComposer에서 관리
-            })
+            }
             
             self.logger.log_info(f"개요 생성 완료: {len(outline['sections'])}개 섹션")
             return outline
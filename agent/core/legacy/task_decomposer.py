@@ -5,15 +5,22 @@ RFP(제안요청서) 분석을 위한 작업을 체계적으로 분류하고 우
 
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from utils.logger import Logger
 from utils.validators import Validator
 from utils.exceptions import TaskError
 from ..memory.short_term import ShortTermMemory
 from ..memory.long_term import LongTermMemory
 from ..memory.working import WorkingMemory
-import uuid
+import heapq
+import itertools
+import os
 import re
+from operator import itemgetter
+
+# 모듈 단위로 공유하는 로거와 검증기
+_LOGGER = Logger(__name__)
+_VALIDATOR = Validator()
 
 class TaskDecomposer:
     """
@@ -22,10 +29,13 @@ class TaskDecomposer:
     각 작업은 고유 ID, 유형, 설명, 우선순위, 의존성을 가집니다.
     """
     
+    # 작업 ID 생성용 카운터 (프로세스 간 구분을 위해 PID를 접두사로 사용)
+    _task_counter = itertools.count()
+    
     def __init__(self):
         # 기본 유틸리티 초기화
-        self.logger = Logger(__name__)  # 로깅 시스템
-        self.validator = Validator()    # 데이터 검증기
+        self.logger = _LOGGER           # 로깅 시스템
+        self.validator = _VALIDATOR     # 데이터 검증기
         
         # 메모리 시스템 초기화
         self.short_term_memory = ShortTermMemory()  # 단기 기억 (최근 컨텍스트)
@@ -74,13 +84,26 @@ class TaskDecomposer:
                 'dependencies': ['scope', 'case']
             }
         }
+        
+        # 검증용 작업 유형 집합
+        self._valid_types = frozenset(self.task_types)
+        
+        # 작업 유형별 키워드를 하나의 정규식으로 미리 컴파일
+        self._keyword_patterns = {
+            task_type: re.compile(
+                r'[^.]*(?:' + '|'.join(re.escape(k) for k in config['keywords']) + r')[^.]*\.',
+                re.IGNORECASE
+            )
+            for task_type, config in self.task_types.items()
+        }
 
-    def decompose_request(self, user_request: str) -> List[Dict]:
+    def decompose_request(self, user_request: str, top_k: Optional[int] = None) -> List[Dict]:
         """
         사용자 요청을 구조화된 작업으로 분해하는 메인 메서드
         
         Args:
             user_request (str): 사용자의 원본 요청 텍스트
+            top_k (Optional[int]): 지정 시 우선순위 상위 k개 작업만 반환
             
         Returns:
             List[Dict]: 작업 목록. 각 작업은 다음 정보를 포함:
@@ -97,12 +120,13 @@ class TaskDecomposer:
             # 최근 컨텍스트 가져오기
             context = self.short_term_memory.get_recent_context()
             
-            # 작업 목록 초기화
+            # 작업 목록 초기화 (작업 유형 -> 작업 ID 매핑을 함께 유지)
             tasks = []
+            type_to_id = {}
             
             # 각 작업 유형별로 작업 생성
             for task_type, config in self.task_types.items():
-                task_id = str(uuid.uuid4())[:8]  # 고유 ID 생성
+                task_id = f"t{os.getpid():x}-{next(self._task_counter):08x}"  # 고유 ID 생성
                 description = self._generate_task_description(user_request, task_type, config['keywords'])
                 
                 task = {
@@ -110,17 +134,18 @@ class TaskDecomposer:
                     'task_type': task_type,
                     'description': description,
                     'priority': config['priority'],
-                    'dependencies': self._get_dependencies(task_id, task_type, tasks)
+                    'dependencies': self._get_dependencies(task_type, type_to_id)
                 }
                 tasks.append(task)
+                type_to_id[task_type] = task_id
             
-            # 컨텍스트 기반 우선순위 조정
-            tasks = self._adjust_priorities(tasks, context)
-            
-            # 작업 유효성 검증
+            # 작업 유효성 검증 (정렬/선택 전 생성 순서 기준)
             if not self.validate_tasks(tasks):
                 raise TaskError("유효하지 않은 작업 구조")
             
+            # 컨텍스트 기반 우선순위 조정
+            tasks = self._adjust_priorities(tasks, context, top_k)
+            
             # 작업 메모리에 저장
             self.working_memory.set_current_task({'tasks': tasks, 'request': user_request})
             
@@ -153,11 +178,7 @@ class TaskDecomposer:
             }
             
             # 키워드 기반 관련 내용 추출
-            relevant_parts = []
-            for keyword in keywords:
-                pattern = f"[^.]*{keyword}[^.]*\\."
-                matches = re.findall(pattern, request, re.IGNORECASE)
-                relevant_parts.extend(matches)
+            relevant_parts = self._keyword_patterns[task_type].findall(request)
             
             # 기본 프롬프트와 관련 내용 결합
             description = f"{prompts[task_type]}"
@@ -170,61 +191,60 @@ class TaskDecomposer:
             self.logger.log_error(f"작업 설명 생성 중 오류 발생: {str(e)}")
             return prompts[task_type]  # 기본 프롬프트로 폴백
 
-    def _get_dependencies(self, task_id: str, task_type: str, existing_tasks: List[Dict]) -> List[str]:
+    def _get_dependencies(self, task_type: str, type_to_id: Dict[str, str]) -> List[str]:
         """
         작업 의존성 관리 메서드
         
         Args:
-            task_id (str): 현재 작업 ID
             task_type (str): 작업 유형
-            existing_tasks (List[Dict]): 기존 작업 목록
+            type_to_id (Dict[str, str]): 이미 생성된 작업의 유형 -> 작업 ID 매핑
             
         Returns:
             List[str]: 의존성 있는 작업 ID 목록
         """
-        try:
-            dependencies = []
-            required_types = self.task_types[task_type]['dependencies']
-            
-            for task in existing_tasks:
-                if task['task_type'] in required_types:
-                    dependencies.append(task['task_id'])
-            
-            return dependencies
-            
-        except Exception as e:
-            self.logger.log_error(f"의존성 확인 중 오류 발생: {str(e)}")
+        # 알 수 없는 작업 유형은 의존성 없음으로 처리
+        if task_type not in self.task_types:
             return []
+        
+        return [
+            type_to_id[required_type]
+            for required_type in self.task_types[task_type]['dependencies']
+            if required_type in type_to_id
+        ]
 
-    def _adjust_priorities(self, tasks: List[Dict], context: Dict) -> List[Dict]:
+    def _adjust_priorities(self, tasks: List[Dict], context: Dict, top_k: Optional[int] = None) -> List[Dict]:
         """
         작업 우선순위 조정 메서드
         
         Args:
             tasks (List[Dict]): 작업 목록
             context (Dict): 현재 컨텍스트
+            top_k (Optional[int]): 지정 시 전체 정렬 대신 상위 k개만 선택
             
         Returns:
             List[Dict]: 우선순위가 조정된 작업 목록
         """
         try:
-            # 과거 성과 데이터 가져오기
-            history = self.long_term_memory.get_task_history()
+            # 과거 성과 데이터 가져오기 (작업 유형별 성공률을 한 번만 조회)
+            history = self.long_term_memory.get_task_history() or {}
+            rates = {
+                task_type: history.get(task_type, {}).get('success_rate', 1.0)
+                for task_type in self.task_types
+            }
             
             for task in tasks:
-                base_priority = task['priority']
-                
-                # 과거 성공률 기반 우선순위 조정
-                if history and task['task_type'] in history:
-                    success_rate = history[task['task_type']].get('success_rate', 1.0)
-                    task['priority'] = int(base_priority / success_rate)
-                
-                # 의존성 수에 따른 우선순위 조정
-                if task['dependencies']:
-                    task['priority'] += len(task['dependencies'])
+                # 과거 성공률 및 의존성 수 기반 우선순위 조정
+                task['priority'] = (
+                    int(task['priority'] / rates.get(task['task_type'], 1.0))
+                    + len(task['dependencies'])
+                )
+            
+            # 상위 k개만 필요한 경우 전체 정렬 없이 선택
+            if top_k is not None:
+                return heapq.nsmallest(top_k, tasks, key=itemgetter('priority'))
             
             # 우선순위 기준 정렬
-            tasks.sort(key=lambda x: x['priority'])
+            tasks.sort(key=itemgetter('priority'))
             return tasks
             
         except Exception as e:
@@ -245,24 +265,19 @@ class TaskDecomposer:
             if not isinstance(tasks, list):
                 return False
             
-            task_ids = set()
+            # 전체 작업 ID를 먼저 수집 (의존성이 뒤에 오는 작업을 참조해도 허용)
+            all_ids = {task['task_id'] for task in tasks}
+            
+            # 중복 작업 ID 확인
+            if len(all_ids) != len(tasks):
+                return False
+            
             for task in tasks:
-                if not self.validator.validate_task(task):
-                    return False
-                    
-                # 중복 작업 ID 확인
-                if task['task_id'] in task_ids:
+                # 구조, 작업 유형, 의존성 유효성 확인
+                if (not self.validator.validate_task(task)
+                        or task['task_type'] not in self._valid_types
+                        or not all_ids.issuperset(task['dependencies'])):
                     return False
-                task_ids.add(task['task_id'])
-                
-                # 작업 유형 유효성 확인
-                if task['task_type'] not in self.task_types:
-                    return False
-                
-                # 의존성 유효성 확인
-                for dep_id in task['dependencies']:
-                    if dep_id not in task_ids:
-                        return False
             
             return True
             
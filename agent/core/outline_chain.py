@@ -1,4 +1,3 @@
-from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel
@@ -90,6 +89,11 @@ class OutlineChain:
             logger.error(f"개요 생성 중 오류 발생: {str(e)}")
             raise
 
+_outline_chain = None
+
 def create_outline_chain() -> OutlineChain:
-    """개요 생성 체인을 생성합니다."""
-    return OutlineChain()
\ No newline at end of file
+    """개요 생성 체인을 생성합니다. 최초 호출 시 한 번만 생성하고 이후에는 재사용합니다."""
+    global _outline_chain
+    if _outline_chain is None:
+        _outline_chain = OutlineChain()
+    return _outline_chain
\ No newline at end of file
@@ -12,7 +12,7 @@ class PerformanceMonitor:
     
     def __init__(self):
         self.metrics: List[Dict] = []
-        self.active_operations: Dict[str, float] = {}
+        self.active_operations: Dict[str, float] = {}  # 작업 이름 -> 시작 시각 (perf_counter 기준)
         
     def start_operation(self, operation_name: str):
         """
@@ -21,7 +21,7 @@ class PerformanceMonitor:
         Args:
             operation_name (str): 작업의 이름
         """
-        self.active_operations[operation_name] = time.time()
+        self.active_operations[operation_name] = time.perf_counter()
         logger.debug(f"작업 시작: {operation_name}")
         
     def end_operation(self, operation_name: str):
@@ -33,7 +33,7 @@ class PerformanceMonitor:
         """
         if operation_name in self.active_operations:
             start_time = self.active_operations[operation_name]
-            end_time = time.time()
+            end_time = time.perf_counter()
             execution_time = end_time - start_time
             
             # 메트릭 기록
@@ -78,9 +78,9 @@ class PerformanceMonitor:
 def measure_performance(func):
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = await func(*args, **kwargs)
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         performance_metrics = {
             "function": func.__name__,
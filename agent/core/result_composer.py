@@ -42,6 +42,15 @@ class ResultComposer:
             Dict: 작성된 RFP 응답서
         """
         try:
+            # 개요 결과가 비어 있으면 메타데이터 구성 없이 조기 반환
+            if not outline_result:
+                return {
+                    'title': 'Empty RFP',
+                    'sections': [],
+                    'metadata': {},
+                    'status': 'empty'
+                }
+            
             # 기본 메타데이터 템플릿
             metadata = {
                 "generated_at": datetime.now().isoformat(),
@@ -51,10 +60,7 @@ class ResultComposer:
             }
             
             # 개요 결과와 메타데이터 결합
-            result = {
-                **outline_result,
-                "metadata": metadata
-            }
+            result = outline_result | {"metadata": metadata}
             
             # RAG 컨텍스트가 있는 경우 추가
             if rag_response:
@@ -3,6 +3,7 @@ from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel
 from typing import List, Dict
+from functools import lru_cache
 from langchain.chat_models import ChatOpenAI
 
 class TaskSchema(BaseModel):
@@ -12,6 +13,7 @@ class TaskSchema(BaseModel):
     priority: int
     dependencies: List[str]
 
+@lru_cache(maxsize=1)
 def create_task_chain():
     prompt = PromptTemplate(
         input_variables=["request", "context"],
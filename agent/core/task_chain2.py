@@ -1,11 +1,10 @@
 import os
 from dotenv import load_dotenv
-from langchain.prompts import PromptTemplate, ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
 
 # Load environment variables from .env file
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', '.env'))
@@ -41,13 +40,7 @@ class EvaluationCriteria(BaseModel):
     quality_standards: List[str] = Field(description="품질 기준들의 리스트")
     performance_indicators: List[str] = Field(description="성과 지표들의 리스트")
 
-class TaskSchema(BaseModel):
-    task_id: str = Field(description="작업의 고유 ID")
-    task_type: str = Field(description="작업의 유형")
-    description: str = Field(description="작업의 상세 설명")
-    priority: int = Field(description="우선순위 (1-5)")
-    dependencies: List[str] = Field(description="의존성 있는 작업들의 ID 리스트")
-
+@lru_cache(maxsize=1)
 def create_purpose_analysis_chain():
     llm = ChatOpenAI(model="gpt-4", temperature=0)
     
@@ -96,6 +89,7 @@ def create_purpose_analysis_chain():
     }])
     return chain
 
+@lru_cache(maxsize=1)
 def create_scope_definition_chain():
     llm = ChatOpenAI(model="gpt-4", temperature=0)
     
@@ -132,6 +126,7 @@ def create_scope_definition_chain():
     }])
     return chain
 
+@lru_cache(maxsize=1)
 def create_case_study_chain():
     llm = ChatOpenAI(model="gpt-4", temperature=0)
     
@@ -162,6 +157,7 @@ def create_case_study_chain():
     }])
     return chain
 
+@lru_cache(maxsize=1)
 def create_evaluation_criteria_chain():
     llm = ChatOpenAI(model="gpt-4", temperature=0)
     
@@ -192,6 +188,7 @@ def create_evaluation_criteria_chain():
     }])
     return chain
 
+@lru_cache(maxsize=1)
 def create_task_chain():
     llm = ChatOpenAI(model="gpt-4", temperature=0)
     
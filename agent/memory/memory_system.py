@@ -2,20 +2,49 @@
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
-import json
+from collections import OrderedDict
+import atexit
+import struct
+import threading
+import time
+import weakref
+import orjson
 from .memory_state import AgentState
 from utils.logger import Logger
 
+# MessagePack 상태 저장 (선택적 의존성)
+# 설치되어 있지 않으면 JSON 파일로 저장합니다
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+_LOGGER = Logger(__name__)
+
+# recent_context 로그 프레임 헤더 (big-endian uint32 길이)
+_FRAME_HEADER = struct.Struct(">I")
+
+# 종료 시 저장할 인스턴스 목록 (약한 참조로 보관하여 세션이 끝난 인스턴스는 정상적으로 해제)
+_LIVE_SYSTEMS = weakref.WeakSet()
+
+@atexit.register
+def _flush_all():
+    """종료 시 살아 있는 모든 인스턴스의 남은 변경 사항 저장"""
+    for system in list(_LIVE_SYSTEMS):
+        system._flush_state()
+
 class MemorySystem:
     """
     통합 메모리 시스템
     AgentState를 사용하여 모든 메모리 관리
     """
     
-    def __init__(self):
-        self.logger = Logger(__name__)
+    def __init__(self, max_patterns: int = 1000):
+        self.logger = _LOGGER
+        self.max_patterns = max_patterns  # 패턴 최대 보관 수 (초과 시 가장 오래 사용되지 않은 패턴 제거)
         self.state: AgentState = {
-            "patterns": {},
+            "patterns": OrderedDict(),
             "recent_context": [],
             "current_task": {},
             "rag_results": [],
@@ -24,38 +53,84 @@ class MemorySystem:
         }
         
         # 파일 저장 경로
+        # 상태 스냅샷은 msgspec이 설치되어 있으면 agent_state.msgpack이 기준이며,
+        # agent_state.json(저장소에 포함된 초기 상태)은 msgpack 파일이 없을 때만 읽어 이전
+        # recent_context는 스냅샷이 아닌 recent_context.*.log 파일이 기준
         self.storage_path = Path("data/memory")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._json_file = self.storage_path / "agent_state.json"
+        self._msgpack_file = self.storage_path / "agent_state.msgpack"
+        
+        # recent_context는 전체 상태와 분리하여 추가 전용(append-only) 로그로 저장
+        # 각 프레임은 [4바이트 길이][직렬화된 상호작용] 형식
+        log_format = "msgpack" if MSGSPEC_AVAILABLE else "json"
+        self._context_log = self.storage_path / f"recent_context.{log_format}.log"
+        self._context_log_frames = 0
+        self._max_context = 100
+        self._context_log_limit = self._max_context * 2  # 초과 시 로그 압축
+        
+        # 저장 지연(debounce) 설정: 연속된 변경은 최대 flush_interval초마다 한 번만 파일에 기록
+        # 지연된 변경은 타이머로 마지막에 한 번 더 저장 (trailing flush)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._flush_interval = 1.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.RLock()
         
         # 상태 로드
         self._load_state()
         
+        # 종료 시 남은 변경 사항 저장
+        _LIVE_SYSTEMS.add(self)
+        
     def save_pattern(self, pattern_key: str, pattern_data: Dict) -> bool:
         """장기 패턴 저장"""
         try:
-            self.state["patterns"][pattern_key] = {
+            patterns = self.state["patterns"]
+            patterns[pattern_key] = {
                 **pattern_data,
                 "timestamp": datetime.now().timestamp()
             }
+            patterns.move_to_end(pattern_key)
+            
+            # LRU 방식으로 오래 사용되지 않은 패턴 제거
+            while len(patterns) > self.max_patterns:
+                patterns.popitem(last=False)
+                
             self._save_state()
             return True
         except Exception as e:
             self.logger.log_error(f"패턴 저장 실패: {str(e)}")
             return False
             
+    def get_pattern(self, pattern_key: str) -> Optional[Dict]:
+        """장기 패턴 조회 (조회된 패턴은 최근 사용으로 갱신)"""
+        patterns = self.state["patterns"]
+        pattern = patterns.get(pattern_key)
+        if pattern is not None:
+            patterns.move_to_end(pattern_key)
+        return pattern
+            
     def add_interaction(self, interaction: Dict) -> bool:
         """최근 컨텍스트에 상호작용 추가"""
         try:
-            self.state["recent_context"].append({
+            entry = {
                 **interaction,
                 "timestamp": datetime.now().timestamp()
-            })
+            }
+            self.state["recent_context"].append(entry)
             
             # 최근 컨텍스트 크기 제한 (예: 최근 100개)
-            if len(self.state["recent_context"]) > 100:
-                self.state["recent_context"] = self.state["recent_context"][-100:]
-                
-            self._save_state()
+            # 새 리스트를 만들지 않고 앞쪽 항목만 제자리에서 삭제
+            context = self.state["recent_context"]
+            if len(context) > self._max_context:
+                del context[:-self._max_context]
+            
+            # 전체 상태를 다시 쓰지 않고 로그에 새 항목만 추가
+            if self._context_log_frames >= self._context_log_limit:
+                self._compact_context_log()
+            else:
+                self._append_context(entry)
             return True
         except Exception as e:
             self.logger.log_error(f"상호작용 추가 실패: {str(e)}")
@@ -89,41 +164,150 @@ class MemorySystem:
         """현재 상태 조회"""
         return self.state
         
+    def export_pretty(self, path: Optional[Path] = None) -> str:
+        """디버깅용으로 현재 상태를 들여쓰기된 JSON 문자열로 반환 (path 지정 시 파일로도 저장)"""
+        pretty = orjson.dumps(
+            self.state,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+        if path is not None:
+            Path(path).write_bytes(pretty)
+        return pretty.decode()
+        
     def _save_state(self):
-        """상태를 파일에 저장"""
+        """상태 변경을 기록하고, 마지막 저장 후 일정 시간이 지났으면 파일에 저장"""
+        with self._flush_lock:
+            self._dirty = True
+            elapsed = time.monotonic() - self._last_flush
+            if elapsed > self._flush_interval:
+                self._flush_state()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval - elapsed, self._flush_state)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            
+    def _flush_state(self):
+        """변경된 상태를 파일에 저장"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._write_snapshot()
+                
+    def _write_snapshot(self):
+        """상태 스냅샷을 파일에 기록"""
         try:
-            state_file = self.storage_path / "agent_state.json"
-            with state_file.open("w", encoding="utf-8") as f:
-                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            # recent_context는 별도 로그 파일에 저장되므로 스냅샷에서 제외
+            snapshot = {k: v for k, v in self.state.items() if k != "recent_context"}
+            if MSGSPEC_AVAILABLE:
+                self._msgpack_file.write_bytes(msgspec.msgpack.encode(snapshot))
+            else:
+                self._json_file.write_bytes(orjson.dumps(
+                    snapshot,
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
             self.logger.log_error(f"상태 저장 실패: {str(e)}")
             
     def _load_state(self):
         """파일에서 상태 로드"""
         try:
-            state_file = self.storage_path / "agent_state.json"
-            if state_file.exists():
-                with state_file.open("r", encoding="utf-8") as f:
-                    loaded_state = json.load(f)
-                    self.state.update(loaded_state)
+            if MSGSPEC_AVAILABLE and self._msgpack_file.exists():
+                loaded_state = msgspec.msgpack.decode(self._msgpack_file.read_bytes(), type=dict)
+            elif self._json_file.exists():
+                loaded_state = orjson.loads(self._json_file.read_bytes())
+                # 기존 JSON 상태는 다음 저장 시 MessagePack으로 이전
+                self._dirty = MSGSPEC_AVAILABLE
+            else:
+                loaded_state = {}
+            
+            self.state.update(loaded_state)
+            self.state["patterns"] = OrderedDict(self.state["patterns"])
+            
+            if self._context_log.exists():
+                self.state["recent_context"] = self._load_context_log()
+            elif self.state["recent_context"]:
+                # 스냅샷에 포함된 기존 recent_context를 로그로 이전
+                self._compact_context_log()
         except Exception as e:
             self.logger.log_error(f"상태 로드 실패: {str(e)}")
     
+    def _encode(self, data) -> bytes:
+        """로그 프레임 직렬화"""
+        if MSGSPEC_AVAILABLE:
+            return msgspec.msgpack.encode(data)
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    
+    def _decode(self, blob: bytes):
+        """로그 프레임 역직렬화"""
+        if MSGSPEC_AVAILABLE:
+            return msgspec.msgpack.decode(blob)
+        return orjson.loads(blob)
+    
+    def _frame(self, entry: Dict) -> bytes:
+        """길이 헤더를 붙인 로그 프레임 생성"""
+        blob = self._encode(entry)
+        return _FRAME_HEADER.pack(len(blob)) + blob
+    
+    def _append_context(self, entry: Dict):
+        """recent_context 로그에 항목 하나를 추가"""
+        try:
+            with open(self._context_log, "ab") as f:
+                f.write(self._frame(entry))
+            self._context_log_frames += 1
+        except Exception as e:
+            self.logger.log_error(f"컨텍스트 로그 추가 실패: {str(e)}")
+    
+    def _compact_context_log(self):
+        """현재 recent_context만 남기도록 로그 파일을 새로 작성"""
+        try:
+            context = self.state["recent_context"]
+            self._context_log.write_bytes(b"".join(self._frame(entry) for entry in context))
+            self._context_log_frames = len(context)
+        except Exception as e:
+            self.logger.log_error(f"컨텍스트 로그 압축 실패: {str(e)}")
+    
+    def _load_context_log(self) -> List[Dict]:
+        """recent_context 로그를 읽어 최근 항목만 반환"""
+        data = self._context_log.read_bytes()
+        header_size = _FRAME_HEADER.size
+        entries = []
+        offset = 0
+        while offset + header_size <= len(data):
+            (length,) = _FRAME_HEADER.unpack_from(data, offset)
+            start = offset + header_size
+            if start + length > len(data):
+                break
+            entries.append(self._decode(data[start:start + length]))
+            offset = start + length
+        if offset < len(data):
+            # 기록 도중 중단된 마지막 프레임은 잘라냄
+            # (남겨두면 이후 추가되는 프레임이 모두 그 뒤에 쓰여 다음 로드에서 유실됨)
+            with open(self._context_log, "r+b") as f:
+                f.truncate(offset)
+        self._context_log_frames = len(entries)
+        return entries[-self._max_context:]
+    
     def clear_state(self) -> None:
         """상태 초기화"""
         try:
+            now = datetime.now().timestamp()
             self.state = {
-                "patterns": {},
+                "patterns": OrderedDict(),
                 "recent_context": [],
                 "current_task": {},
                 "rag_results": [],
-                "timestamp": datetime.now().timestamp(),
+                "timestamp": now,
                 "metadata": {
                     "version": "1.0",
-                    "last_cleanup": datetime.now().timestamp()
+                    "last_cleanup": now
                 }
             }
             self._save_state()
+            self._compact_context_log()
             self.logger.log_info("State cleared successfully")
         except Exception as e:
             self.logger.log_error(f"Error clearing state: {str(e)}")
\ No newline at end of file
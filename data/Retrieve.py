@@ -1,7 +1,13 @@
 import sys
 import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables from config/.env
 config_dir = Path(__file__).parent.parent / "config"
 env_path = config_dir / ".env"
@@ -9,73 +15,174 @@ if env_path.exists():
     from dotenv import load_dotenv
     load_dotenv(env_path)
 else:
-    print(f"Warning: .env file not found at {env_path}")
+    logger.warning(f".env file not found at {env_path}")
 # Check for OpenAI API key
 if not os.getenv("OPENAI_API_KEY"):
     raise ValueError("OPENAI_API_KEY environment variable is not set")
 
 try:
-    print("Attempting to import langchain_community...")
-    import langchain_community
-    print(f"langchain_community version: {langchain_community.__version__}")
     from langchain_community.vectorstores import FAISS
-    print("Successfully imported langchain_community")
-    
-    print("Attempting to import langchain_openai...")
-    import langchain_openai
-    print("Successfully imported langchain_openai")
+    from langchain_community.vectorstores.utils import DistanceStrategy
     from langchain_openai import OpenAIEmbeddings
-    print("Successfully imported OpenAIEmbeddings")
+    import numpy as np
+    import faiss
 except ImportError as e:
-    print(f"Error importing required packages: {e}")
-    print(f"Current working directory: {os.getcwd()}")
-    print(f"Python executable: {sys.executable}")
-    print(f"Installed packages:")
-    os.system("pip list")
+    logger.error(f"Error importing required packages: {e} (python: {sys.executable})")
     raise
 
 # Get the absolute path to the data directory
 DATA_DIR = Path(__file__).parent
-print(f"Data directory: {DATA_DIR}")
-
+logger.debug(f"Data directory: {DATA_DIR}")
 
-embeddings = OpenAIEmbeddings()
-print("Successfully initialized embeddings")
-
-print("Loading case database...")
 case_db_path = str(DATA_DIR / "vector_db_case")
-print(f"Case DB path: {case_db_path}")
-loaded_case_db = FAISS.load_local(
-    folder_path=case_db_path,
-    embeddings=embeddings,
-    allow_dangerous_deserialization=True,
-    index_name="case_vector"
-)
-print("Successfully loaded case database")
-
-print("Loading criteria database...")
 criteria_db_path = str(DATA_DIR / "vector_db_criteria")
-print(f"Criteria DB path: {criteria_db_path}")
-loaded_criteria_db = FAISS.load_local(
-    folder_path=criteria_db_path,
-    embeddings=embeddings,
-    allow_dangerous_deserialization=True,
-    index_name="criteria_vector"
-)
 
-_case_retriever = loaded_case_db.as_retriever(k=5)
-_criteria_retriever = loaded_criteria_db.as_retriever(k=10)
+# 각 데이터베이스에서 가져올 문서 수
+CASE_K = 5
+CRITERIA_K = 10
+
+# HNSW 인덱스 검색 시 탐색 폭 (클수록 정확도↑, 속도↓)
+HNSW_EF_SEARCH = 64
+# IVF 인덱스 검색 시 조회할 클러스터 수
+IVF_NPROBE = 8
+
+# 두 데이터베이스 검색을 동시에 실행하기 위한 스레드 풀 (FAISS 검색은 GIL을 해제함)
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="retrieve")
+
+# 로드된 FAISS 인덱스 캐시 (folder_path:index_name -> FAISS)
+# 프로세스당 한 번만 디스크에서 읽고 이후 호출은 캐시를 재사용
+_INDEX_CACHE = {}
+_INDEX_LOCK = threading.Lock()
+
+
+# CUDA를 지원하는 faiss(faiss-gpu)가 설치되어 있고 GPU가 있으면 인덱스를 GPU로 옮겨 검색
+# GPU가 없거나 GPU에서 지원하지 않는 인덱스(HNSW 등)는 CPU 인덱스를 그대로 사용
+@lru_cache(maxsize=1)
+def _get_gpu_resources():
+    if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        return None
+    return faiss.StandardGpuResources()
+
+
+def _to_gpu(index):
+    resources = _get_gpu_resources()
+    if resources is None:
+        return index
+    try:
+        return faiss.index_cpu_to_gpu(resources, 0, index)
+    except RuntimeError as e:
+        logger.warning(f"GPU index not available, using CPU index: {e}")
+        return index
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings():
+    return OpenAIEmbeddings()
+
+
+# 같은 쿼리는 임베딩 API를 다시 호출하지 않도록 캐시
+@lru_cache(maxsize=256)
+def _embed_query(query):
+    return tuple(_get_embeddings().embed_query(query))
+
+
+def _is_inner_product(index):
+    return index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+
+def _load_index(folder_path, index_name):
+    key = f"{folder_path}:{index_name}"
+    db = _INDEX_CACHE.get(key)
+    if db is None:
+        with _INDEX_LOCK:
+            db = _INDEX_CACHE.get(key)
+            if db is None:
+                logger.info(f"Loading {index_name} from {folder_path}")
+                db = FAISS.load_local(
+                    folder_path=folder_path,
+                    embeddings=_get_embeddings(),
+                    allow_dangerous_deserialization=True,
+                    index_name=index_name
+                )
+                # 거리 방식은 저장된 인덱스의 metric에 맞춤
+                # (기존 IndexFlatL2 저장소는 L2 거리, dataloader.py로 새로 만든 내적 인덱스는
+                #  쿼리 벡터도 L2 정규화 후 내적으로 검색)
+                if _is_inner_product(db.index):
+                    db = FAISS(
+                        embedding_function=db.embedding_function,
+                        index=db.index,
+                        docstore=db.docstore,
+                        index_to_docstore_id=db.index_to_docstore_id,
+                        normalize_L2=True,
+                        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+                    )
+                if hasattr(db.index, "hnsw"):
+                    db.index.hnsw.efSearch = HNSW_EF_SEARCH
+                elif hasattr(db.index, "nprobe"):
+                    db.index.nprobe = IVF_NPROBE
+                db.index = _to_gpu(db.index)
+                _INDEX_CACHE[key] = db
+    return db
+
+
+def get_case_db():
+    return _load_index(case_db_path, "case_vector")
+def get_criteria_db():
+    return _load_index(criteria_db_path, "criteria_vector")
+
 
 #각각의 데이터베이스를 기반으로 한 retriever 반환
 #QA체인 등을 만들때 retriever 인자로 사용
+@lru_cache(maxsize=1)
 def get_case_retriever():
-    return _case_retriever
+    return get_case_db().as_retriever(search_kwargs={"k": CASE_K})
+@lru_cache(maxsize=1)
 def get_criteria_retriever():
-    return _criteria_retriever
+    return get_criteria_db().as_retriever(search_kwargs={"k": CRITERIA_K})
+
+
+#case 검색은 스레드 풀에서, criteria 검색은 현재 스레드에서 동시에 실행
+def _search_both(case_search, criteria_search):
+    case_future = _SEARCH_EXECUTOR.submit(case_search)
+    criteria_results = criteria_search()
+    return case_future.result(), criteria_results
 
 
 #각각의 데이터베이스에서 검색한 결과를 합치는 함수
 #반환값은 Document 형식
+#쿼리 임베딩은 한 번만 계산해서 두 데이터베이스 검색에 재사용
 def double_retrieve(query):
-    return _case_retriever.invoke(query)+_criteria_retriever.invoke(query)
+    vector = list(_embed_query(query))
+    case_docs, criteria_docs = _search_both(
+        lambda: get_case_db().similarity_search_by_vector(vector, k=CASE_K),
+        lambda: get_criteria_db().similarity_search_by_vector(vector, k=CRITERIA_K),
+    )
+    return case_docs + criteria_docs
+
+
+#FAISS 인덱스에 여러 쿼리 벡터를 한 번에 검색하고 Document 목록으로 변환
+#내적 인덱스는 similarity_search와 동일하게 쿼리 벡터를 L2 정규화
+def _batch_search(db, matrix, k):
+    if _is_inner_product(db.index):
+        matrix = matrix.copy()
+        faiss.normalize_L2(matrix)
+    _, indices = db.index.search(matrix, k)
+    return [
+        [db.docstore.search(db.index_to_docstore_id[i]) for i in row if i != -1]
+        for row in indices
+    ]
+
 
+#여러 쿼리에 대한 double_retrieve를 한 번에 처리
+#임베딩 API 호출 1회 + 데이터베이스별 FAISS 검색 1회로 모든 쿼리를 처리
+#반환값은 쿼리 순서대로의 Document 리스트 목록
+def batch_double_retrieve(queries):
+    queries = list(queries)
+    if not queries:
+        return []
+    matrix = np.asarray(_get_embeddings().embed_documents(queries), dtype=np.float32)
+    case_results, criteria_results = _search_both(
+        lambda: _batch_search(get_case_db(), matrix, CASE_K),
+        lambda: _batch_search(get_criteria_db(), matrix, CRITERIA_K),
+    )
+    return [case + criteria for case, criteria in zip(case_results, criteria_results)]
@@ -2,10 +2,13 @@ from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import os
+import hashlib
 from langchain_upstage import UpstageDocumentParseLoader
 import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_community.document_loaders import TextLoader
 from dotenv import load_dotenv
 
@@ -14,20 +17,55 @@ load_dotenv()
 #import crawring
 print("dataloader is loaded!")
 embeddings = OpenAIEmbeddings()
-dimension_size = len(embeddings.embed_query("hello world"))
+# 임베딩 차원은 모델에 따라 고정되므로 API를 호출해 측정하지 않고 상수로 사용
+# (기본 모델 text-embedding-ada-002 = 1536, 다른 모델 사용 시 EMBED_DIM 환경 변수로 지정)
+EMBED_DIM = int(os.getenv("EMBED_DIM", 1536))
+dimension_size = EMBED_DIM
 
+# 모든 벡터는 L2 정규화해서 저장하고 내적(inner product)으로 검색
+# 단위 벡터에서는 내적 순위가 코사인 유사도/L2 거리 순위와 같고, 내적 계산이 더 빠름 (거리 값은 클수록 유사)
+
+# HNSW 그래프 인덱스: 학습 없이 전체 벡터를 훑지 않고 로그 시간에 근사 검색
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+
+def build_hnsw_index(dimension):
+    index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    return index
+
+# IVF-PQ 인덱스: 벡터를 PQ 코드(PQ_M 바이트)로 압축해 메모리 사용량과 검색 시 메모리 대역폭을 줄임
+IVF_NLIST = 64
+PQ_M = 16
+PQ_NBITS = 8
+IVF_NPROBE = 8
+# IVF/PQ 학습에 필요한 최소 벡터 수 (faiss 권장: 클러스터당 39개), 부족하면 HNSW 사용
+IVFPQ_MIN_TRAIN = 39 * IVF_NLIST
+
+def build_ivfpq_index(vectors):
+    quantizer = faiss.IndexFlatIP(vectors.shape[1])
+    index = faiss.IndexIVFPQ(quantizer, vectors.shape[1], IVF_NLIST, PQ_M, PQ_NBITS, faiss.METRIC_INNER_PRODUCT)
+    index.train(vectors)
+    index.nprobe = IVF_NPROBE
+    return index
+
+# 모든 벡터 DB가 하나의 임베딩 클라이언트(HTTP 연결 풀)를 공유
 db_case = FAISS(
-    embedding_function=OpenAIEmbeddings(),
-    index=faiss.IndexFlatL2(dimension_size),
+    embedding_function=embeddings,
+    index=build_hnsw_index(dimension_size),
     docstore=InMemoryDocstore(),
     index_to_docstore_id={},
+    normalize_L2=True,
+    distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
 )
 
 db_criteria = FAISS(
-    embedding_function=OpenAIEmbeddings(),
-    index=faiss.IndexFlatL2(dimension_size),
+    embedding_function=embeddings,
+    index=build_hnsw_index(dimension_size),
     docstore=InMemoryDocstore(),
     index_to_docstore_id={},
+    normalize_L2=True,
+    distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
 )
 
 def load_data(file_path):
@@ -57,14 +95,61 @@ def load_data(file_path):
         pages = text_splitter.split_documents(pages)
         return pages
 
+# 내용이 같은 청크는 한 번만 임베딩 (공백을 정규화한 텍스트의 SHA-256으로 판별)
+# 같은 문서가 다른 파일명으로 중복 저장된 경우 임베딩 API 호출을 줄임
+def dedupe_documents(documents, seen_hashes):
+    unique = []
+    for doc in documents:
+        digest = hashlib.sha256(" ".join(doc.page_content.split()).encode("utf-8")).digest()
+        if digest not in seen_hashes:
+            seen_hashes.add(digest)
+            unique.append(doc)
+    return unique
+
+
+# 파일별로 add_documents를 호출하면 작은 임베딩 요청이 여러 번 발생하므로
+# 모든 청크를 모은 뒤 EMBEDDING_BATCH_SIZE 단위로 한 번에 임베딩
+EMBEDDING_BATCH_SIZE = 1000
+
+def embed_documents(documents):
+    texts = [doc.page_content for doc in documents]
+    vectors = np.asarray(embeddings.embed_documents(texts, chunk_size=EMBEDDING_BATCH_SIZE), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return texts, vectors
+
+def add_embedded_documents(db, documents, texts, vectors):
+    db.add_embeddings(
+        text_embeddings=list(zip(texts, vectors.tolist())),
+        metadatas=[doc.metadata for doc in documents],
+    )
+
+
+case_hashes = set()
+criteria_hashes = set()
+case_documents = []
+criteria_documents = []
+# scandir은 디렉터리 항목과 파일 종류를 한 번에 반환하므로 파일마다 stat을 다시 하지 않음
+with os.scandir("./data/data_source") as entries:
+    for entry in entries:
+        if not entry.is_file():
+            continue
+        file = entry.name
+        print(file)
+        if file.startswith("case_"): # 케이스 데이터 로드
+            case_documents.extend(dedupe_documents(load_data(entry.path), case_hashes))
+        elif file.startswith("criteria_"): # 기준 데이터 로드
+            criteria_documents.extend(dedupe_documents(load_data(entry.path), criteria_hashes))
+
+if case_documents:
+    case_texts, case_vectors = embed_documents(case_documents)
+    add_embedded_documents(db_case, case_documents, case_texts, case_vectors)
 
-for file in os.listdir("./data/data_source"):
-    print(file)
-    file_path = f"./data/data_source/{file}"
-    if file.startswith("case_"): # 케이스 데이터 로드
-        db_case.add_documents(documents=load_data(file_path))
-    elif file.startswith("criteria_"): # 기준 데이터 로드   
-        db_criteria.add_documents(documents=load_data(file_path))
+# 기준 데이터는 임베딩을 모두 계산한 뒤, 충분하면 IVF-PQ 인덱스를 학습시켜 사용
+if criteria_documents:
+    criteria_texts, criteria_vectors = embed_documents(criteria_documents)
+    if len(criteria_vectors) >= IVFPQ_MIN_TRAIN:
+        db_criteria.index = build_ivfpq_index(criteria_vectors)
+    add_embedded_documents(db_criteria, criteria_documents, criteria_texts, criteria_vectors)
 db_case.save_local(folder_path="./data/vector_db_case", index_name="case_vector")
 db_criteria.save_local(folder_path="./data/vector_db_criteria", index_name="criteria_vector")
 
@@ -1,11 +1,14 @@
 import os
 import json
+import hashlib
+import threading
 import requests
-from typing import List
+from collections import OrderedDict
+from typing import List, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 from openai import OpenAI
-from data.Retrieve import double_retrieve
+from data.Retrieve import double_retrieve, batch_double_retrieve
 
 env_path = Path(__file__).parent.parent / "config" / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -15,27 +18,63 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
-def rag_pipeline(context: List[str], query: str) -> str:
-    context_text = "\n".join(context)
-    prompt = f"""
+# 응답 캐시: 같은 문서(context)와 질문(query)에 대해서는 LLM을 다시 호출하지 않음
+# 질문 문장이 고정되어 있고 문서만 바뀌는 경우가 많으므로, 질문만으로 유사도 캐시를 하지 않고 둘을 함께 키로 사용
+RESPONSE_CACHE_SIZE = 128
+_response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _cache_key(context: List[str], query: str) -> bytes:
+    return hashlib.sha256("\n".join(context).encode("utf-8") + b"\0" + query.encode("utf-8")).digest()
+
+def _cache_get(key: bytes) -> Optional[str]:
+    with _response_cache_lock:
+        answer = _response_cache.get(key)
+        if answer is not None:
+            _response_cache.move_to_end(key)
+        return answer
+
+def _cache_put(key: bytes, answer: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = answer
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+# 프롬프트의 고정된 부분은 미리 만들어 두고, 호출마다 문서/질문만 이어 붙임
+_PROMPT_PREFIX = """
     다음 문서는 신뢰도 높은 공식적인 문서다.
     이를 참고하고, 반드시 문서에만 근거해서 답변한다.
 
     문서:
-    {context_text}
+    """
+_PROMPT_MIDDLE = """
 
     질문:
-    {query}
     """
-    response = openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": """너는 문서를 기반으로 응답하는 시스템이다. 오직 제공된 문서 내용만 사용해서 대답한다. 
+_PROMPT_SUFFIX = """
+    """
+
+def _build_messages(context: List[str], query: str) -> List[dict]:
+    prompt = "".join((_PROMPT_PREFIX, "\n".join(context), _PROMPT_MIDDLE, query, _PROMPT_SUFFIX))
+    return [
+        {"role": "system", "content": """너는 문서를 기반으로 응답하는 시스템이다. 오직 제공된 문서 내용만 사용해서 대답한다. 
              문서에 나오는 고유명사와 정보는 신뢰할 수 있으며, 활용해야 한다. 
              또한 답변은 html과 css 형식으로 작성해야 한다.
              """},
-            {"role": "user", "content": prompt}
-        ],
+        {"role": "user", "content": prompt}
+    ]
+
+def rag_pipeline(context: List[str], query: str) -> str:
+    key = _cache_key(context, query)
+    answer = _cache_get(key)
+    if answer is not None:
+        return answer
+    response = openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=_build_messages(context, query),
         temperature=0.0
     )
-    return response.choices[0].message.content.strip()
+    answer = response.choices[0].message.content.strip()
+    _cache_put(key, answer)
+    return answer
@@ -1,20 +1,37 @@
 import streamlit as st
 import sys
-import os
+import json
+import logging
+import re
+import time
 from datetime import datetime
-import importlib.util
+from pathlib import Path
 
-# Add the project root directory to the Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+logger = logging.getLogger(__name__)
 
-# Import the agent interface module
-agent_interface_path = os.path.join(project_root, 'agent', 'core', 'agent_interface.py')
-spec = importlib.util.spec_from_file_location("agent_interface", agent_interface_path)
-agent_interface = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(agent_interface)
-AgentInterface = agent_interface.AgentInterface
+# Add the project root directory to the Python path
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# project_info 기본 스키마 (리스트 필드는 튜플로 고정하고 세션 초기화 때만 리스트로 복사)
+_DEFAULT_PROJECT_INFO = {
+    "project_name": None,
+    "goal": None,
+    "requirements": (),
+    "constraints": (),
+    "timeline": None,
+    "budget": None,
+    "stakeholders": (),
+    "additional_context": ()
+}
+
+def create_agent():
+    """Create the agent, importing the agent package only on first use."""
+    # agent 패키지는 LLM/RAG 의존성이 커서 첫 화면을 그린 뒤에 import
+    # (일반 import는 sys.modules에 캐시되므로 rerun마다 모듈을 다시 실행하지 않음)
+    from agent.core.agent_interface import AgentInterface
+    return AgentInterface()
 
 def initialize_session_state():
     """Initialize session state variables."""
@@ -22,17 +39,13 @@ def initialize_session_state():
         st.session_state.messages = []
     if "project_info" not in st.session_state:
         st.session_state.project_info = {
-            "project_name": None,
-            "goal": None,
-            "requirements": [],
-            "constraints": [],
-            "timeline": None,
-            "budget": None,
-            "stakeholders": [],
-            "additional_context": []
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in _DEFAULT_PROJECT_INFO.items()
         }
-    # Always reinitialize the agent to ensure we have the latest version
-    st.session_state.agent = AgentInterface()
+    # 에이전트는 세션마다 한 번만 생성하고 이후 rerun에서는 재사용
+    # (대화 상태를 갖고 있으므로 세션 간에는 공유하지 않음, 체인/LLM 팩토리는 이미 프로세스 단위로 캐시됨)
+    if "agent" not in st.session_state:
+        st.session_state.agent = create_agent()
     if "conversation_started" not in st.session_state:
         st.session_state.conversation_started = False
     if "outline_generated" not in st.session_state:
@@ -43,24 +56,138 @@ def display_chat_message(message, is_user=False):
     with st.chat_message("user" if is_user else "assistant"):
         st.markdown(message)
 
-def display_outline(result: str):
+# 모델 응답의 ```html / ``` 코드 펜스를 한 번의 스캔으로 제거
+_FENCE_RE = re.compile(r"```(?:html)?")
+
+def display_outline(result: str, container=None):
     """Display the generated outline in a structured format."""
-    html_template = result.replace("```html", "").replace("```", "")
-    st.html(html_template)
+    html_template = _FENCE_RE.sub("", result)
+    (container or st).html(html_template)
+
+def outline_stream(placeholder):
+    """Return a callback that renders outline sections into the placeholder as they arrive."""
+    sections = []
+    def on_section(section: str):
+        sections.append(section)
+        display_outline("\n\n".join(sections), placeholder)
+    return on_section
+
+# 대화 중 개요 재생성 제한: 마지막 생성 후 OUTLINE_MIN_INTERVAL초가 지났거나
+# 새 정보가 OUTLINE_MIN_UPDATES개 이상 쌓였을 때만 다시 생성
+OUTLINE_MIN_INTERVAL = 3.0
+OUTLINE_MIN_UPDATES = 3
 
 def update_project_info(response: str):
     """Update project info based on the response content."""
     project_info = st.session_state.project_info
+    # 최근에 같은 내용이 이미 들어 있으면 추가하지 않음 (프롬프트에 중복 문맥이 쌓이지 않도록)
+    if response in project_info["additional_context"][-10:]:
+        return
     project_info["additional_context"].append(response)
+    st.session_state._pending_updates = st.session_state.get("_pending_updates", 0) + 1
+
+def should_regenerate_outline() -> bool:
+    """Decide whether enough has changed since the last outline to regenerate it."""
+    if "_last_outline" not in st.session_state:
+        return True
+    elapsed = time.monotonic() - st.session_state.get("_last_outline_ts", 0.0)
+    return elapsed > OUTLINE_MIN_INTERVAL or st.session_state.get("_pending_updates", 0) >= OUTLINE_MIN_UPDATES
+
+def generate_outline(project_info, placeholder=None):
+    """Generate outline, reusing the previous result when the inputs have not changed."""
+    agent = st.session_state.agent
+    # 개요는 project_info와 대화에서 추출된 정보로만 결정되므로 둘을 함께 키로 사용
+    outline_key = json.dumps(
+        {"project_info": project_info, "extracted_info": agent.conversation_state["extracted_info"]},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    if st.session_state.get("_last_outline_key") == outline_key:
+        return st.session_state._last_outline
+    # 섹션이 완성되는 대로 placeholder에 먼저 그리고, 완료 후 최종 결과로 덮어씀
+    on_section = outline_stream(placeholder) if placeholder is not None else None
+    result = agent.generate_outline(project_info, on_section=on_section)
+    if result.get("status") == "success":
+        st.session_state._last_outline_key = outline_key
+        st.session_state._last_outline = result
+    st.session_state._last_outline_ts = time.monotonic()
+    st.session_state._pending_updates = 0
+    return result
 
 def generate_outline_directly():
     """Generate outline directly without conversation."""
+    placeholder = st.empty()
     with st.spinner("제안서 개요를 생성하는 중..."):
-        result = st.session_state.agent.generate_outline(st.session_state.project_info)
-        print(result, "result!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!1")
-        display_outline(result["outline"])
+        result = generate_outline(st.session_state.project_info, placeholder)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("outline result: %s", result)
+        display_outline(result["outline"], placeholder)
         st.session_state.outline_generated = True
 
+# 패널별 부분 rerun: 채팅 입력은 채팅 패널만, 개요 버튼은 개요 패널만 다시 실행
+# (st.fragment가 없는 구버전 Streamlit에서는 일반 함수로 동작)
+_fragment = getattr(st, "fragment", None) or (lambda func: func)
+
+@_fragment
+def outline_panel():
+    """Render the direct outline generation panel."""
+    if st.button("RFP 아웃라인 생성하기", type="primary"):
+        generate_outline_directly()
+
+@_fragment
+def chat_panel():
+    """Render the chat history, input, and conversation-driven outline."""
+    # Display chat history
+    for message in st.session_state.messages:
+        display_chat_message(message["content"], message["is_user"])
+
+    # Start conversation if not started
+    if not st.session_state.conversation_started:
+        initial_message = "안녕하세요! 저는 제안서 작성을 도와드리는 AI 어시스턴트입니다. 어떤 프로젝트를 준비하고 계신가요?"
+        display_chat_message(initial_message)
+        st.session_state.messages.append({"content": initial_message, "is_user": False})
+        st.session_state.conversation_started = True
+
+    # Chat input
+    if prompt := st.chat_input("여기에 메시지를 입력하세요..."):
+        # Display user message
+        display_chat_message(prompt, is_user=True)
+        st.session_state.messages.append({"content": prompt, "is_user": True})
+
+        # Update project info
+        update_project_info(prompt)
+
+        # Check if we should continue gathering information
+        if st.session_state.agent.should_continue_conversation(st.session_state.project_info):
+            # Generate next question
+            next_question = st.session_state.agent.generate_next_question(
+                st.session_state.project_info,
+                st.session_state.messages
+            )
+            
+            # Display agent's response
+            display_chat_message(next_question)
+            st.session_state.messages.append({"content": next_question, "is_user": False})
+        else:
+            # We have all required information, generate outline
+            placeholder = st.empty()
+            if should_regenerate_outline():
+                with st.spinner("제안서 개요를 생성하는 중..."):
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("project info: %s", st.session_state.project_info)
+                    result = generate_outline(st.session_state.project_info, placeholder)
+            else:
+                # 짧은 간격의 연속 입력에서는 직전 개요를 그대로 표시
+                result = st.session_state._last_outline
+            display_outline(result["outline"], placeholder)
+            st.session_state.outline_generated = True
+            
+            # Ask if user wants to continue
+            continue_msg = "제안서 개요가 생성되었습니다. 더 자세한 정보를 추가하시겠어요?"
+            display_chat_message(continue_msg)
+            st.session_state.messages.append({"content": continue_msg, "is_user": False})
+
+        # 이번 턴의 메시지는 위에서 이미 그렸으므로 st.rerun()으로 전체 스크립트를 다시 실행하지 않음
+
 def main():
     # Set page config
     st.set_page_config(
@@ -69,9 +196,6 @@ def main():
         layout="wide"
     )
 
-    # Initialize session state
-    initialize_session_state()
-
     # Add title and description
     st.title("🛫 RFP Pilot")
     st.markdown("""
@@ -80,60 +204,15 @@ def main():
     프로젝트에 대해 이야기를 나누어 보세요.
     """)
 
-    # Add direct outline generation button
+    # Initialize session state (헤더를 먼저 그린 뒤 에이전트를 로드)
+    initialize_session_state()
+
+    # 레이아웃은 한 번만 선언하고, 각 패널은 fragment로 독립적으로 rerun
     col1, col2 = st.columns([1, 1])
     with col2:
-        if st.button("RFP 아웃라인 생성하기", type="primary"):
-            
-            generate_outline_directly()
-
+        outline_panel()
     with col1:
-        # Display chat history
-        for message in st.session_state.messages:
-            display_chat_message(message["content"], message["is_user"])
-
-        # Start conversation if not started
-        if not st.session_state.conversation_started:
-            initial_message = "안녕하세요! 저는 제안서 작성을 도와드리는 AI 어시스턴트입니다. 어떤 프로젝트를 준비하고 계신가요?"
-            display_chat_message(initial_message)
-            st.session_state.messages.append({"content": initial_message, "is_user": False})
-            st.session_state.conversation_started = True
-
-        # Chat input
-        if prompt := st.chat_input("여기에 메시지를 입력하세요..."):
-            # Display user message
-            display_chat_message(prompt, is_user=True)
-            st.session_state.messages.append({"content": prompt, "is_user": True})
-
-            # Update project info
-            update_project_info(prompt)
-
-            # Check if we should continue gathering information
-            if st.session_state.agent.should_continue_conversation(st.session_state.project_info):
-                # Generate next question
-                next_question = st.session_state.agent.generate_next_question(
-                    st.session_state.project_info,
-                    st.session_state.messages
-                )
-                
-                # Display agent's response
-                display_chat_message(next_question)
-                st.session_state.messages.append({"content": next_question, "is_user": False})
-            else:
-                # We have all required information, generate outline
-                with st.spinner("제안서 개요를 생성하는 중..."):
-                    print(st.session_state.project_info)
-                    result = st.session_state.agent.generate_outline(st.session_state.project_info)
-                    display_outline(result)
-                    st.session_state.outline_generated = True
-                
-                # Ask if user wants to continue
-                continue_msg = "제안서 개요가 생성되었습니다. 더 자세한 정보를 추가하시겠어요?"
-                display_chat_message(continue_msg)
-                st.session_state.messages.append({"content": continue_msg, "is_user": False})
-
-        # Rerun to update the UI
-            st.rerun()
+        chat_panel()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,50 @@
+import gc
+import time
+import weakref
+
+import pytest
+
+from agent.memory.memory_system import MemorySystem, _FRAME_HEADER
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # MemorySystem은 현재 디렉터리 기준 data/memory에 저장
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_append_after_torn_frame_survives_reload(workdir):
+    memory = MemorySystem()
+    memory.add_interaction({"message": "first"})
+    memory.add_interaction({"message": "second"})
+
+    # 기록 도중 중단된 프레임: 헤더는 100바이트를 가리키지만 본문은 일부만 기록됨
+    with open(memory._context_log, "ab") as f:
+        f.write(_FRAME_HEADER.pack(100) + b"abc")
+
+    reloaded = MemorySystem()
+    assert [e["message"] for e in reloaded.state["recent_context"]] == ["first", "second"]
+    reloaded.add_interaction({"message": "third"})
+
+    context = MemorySystem().state["recent_context"]
+    assert [e["message"] for e in context] == ["first", "second", "third"]
+
+
+def test_instance_is_collectable(workdir):
+    memory = MemorySystem()
+    ref = weakref.ref(memory)
+    del memory
+    gc.collect()
+    assert ref() is None
+
+
+def test_debounced_save_is_flushed_by_timer(workdir):
+    memory = MemorySystem()
+    memory._flush_interval = 0.05
+    memory.save_pattern("first", {"value": 1})
+    memory.save_pattern("second", {"value": 2})
+
+    time.sleep(0.2)
+    assert not memory._dirty
+    assert "second" in MemorySystem().state["patterns"]
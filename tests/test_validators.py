@@ -0,0 +1,30 @@
+from utils.validators import Validator
+
+
+def _task(**overrides):
+    task = {
+        "id": "t1",
+        "type": "purpose",
+        "description": "목적 및 배경을 작성해주세요",
+        "priority": 1,
+        "dependencies": [],
+        "status": "pending",
+        "result": None,
+    }
+    task.update(overrides)
+    return task
+
+
+def test_validate_task_accepts_task():
+    assert Validator.validate_task(_task())
+
+
+def test_validate_task_rejects_missing_key():
+    task = _task()
+    del task["status"]
+    assert not Validator.validate_task(task)
+
+
+def test_validate_task_rejects_wrong_types():
+    assert not Validator.validate_task(_task(description=None))
+    assert not Validator.validate_task(_task(dependencies="t0"))
@@ -1,25 +1,57 @@
 # utils/logger.py
+import json
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
 class Logger:
-    """Shared logging interface"""
+    """Shared logging interface
+
+    Log methods pass their arguments to logging unformatted, so disabled levels cost no formatting.
+    """
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
         self.setup_logging()
 
     def setup_logging(self):
         """Configure logging format and handlers"""
-        pass
+        # Install a single JSON handler per named logger, even if Logger(name) is created repeatedly
+        if not any(isinstance(h.formatter, JsonFormatter) for h in self.logger.handlers):
+            handler = logging.StreamHandler()
+            handler.setFormatter(JsonFormatter())
+            self.logger.addHandler(handler)
+            self.logger.propagate = False
 
     def log_request(self, request_id: str, component: str, action: str):
         """Log request details"""
-        pass
+        self.logger.info("request %s %s %s", request_id, component, action)
+
+    def log_info(self, message: str, *args):
+        """Log informational message"""
+        self.logger.info(message, *args)
 
-    def log_error(self, error: Exception, context: Optional[Dict] = None):
+    def log_error(self, error: Union[Exception, str], context: Optional[Dict] = None):
         """Log error details with context"""
-        pass
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        exc_info = error if isinstance(error, BaseException) else None
+        if context:
+            self.logger.error("%s context=%s", error, context, exc_info=exc_info)
+        else:
+            self.logger.error("%s", error, exc_info=exc_info)
 
     def log_performance(self, operation: str, duration: float):
         """Log performance metrics"""
-        pass
\ No newline at end of file
+        self.logger.info("performance %s %.3fs", operation, duration)
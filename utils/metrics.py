@@ -1,23 +1,59 @@
 # utils/metrics.py
+import statistics
+from collections import Counter, defaultdict, deque
 from typing import Dict, List
 
+# Latency samples kept per operation (oldest samples are dropped beyond this)
+MAX_LATENCY_SAMPLES = 4096
+
 class Metrics:
     """Shared metrics collection interface"""
     def __init__(self):
-        self.metrics = {}
+        self._latency: Dict[str, deque] = defaultdict(lambda: deque(maxlen=MAX_LATENCY_SAMPLES))
+        self._success = Counter()
+        self._error = Counter()
+        self._error_types: Dict[str, Counter] = defaultdict(Counter)
 
     def record_latency(self, operation: str, duration: float):
         """Record operation latency"""
-        pass
+        self._latency[operation].append(duration)
 
     def record_success(self, operation: str):
         """Record successful operations"""
-        pass
+        self._success[operation] += 1
 
     def record_error(self, operation: str, error_type: str):
         """Record error occurrences"""
-        pass
+        self._error[operation] += 1
+        self._error_types[operation][error_type] += 1
 
     def get_metrics(self) -> Dict:
-        """Get collected metrics"""
-        pass
\ No newline at end of file
+        """Get collected metrics (latency summaries are computed on demand)"""
+        operations = set(self._latency) | set(self._success) | set(self._error)
+        return {operation: self._summarize(operation) for operation in operations}
+
+    def _summarize(self, operation: str) -> Dict:
+        summary = {
+            "success": self._success[operation],
+            "error": self._error[operation],
+            "error_types": dict(self._error_types.get(operation, {})),
+        }
+        samples = self._latency.get(operation)
+        if samples:
+            summary["latency"] = self._latency_summary(list(samples))
+        return summary
+
+    @staticmethod
+    def _latency_summary(samples: List[float]) -> Dict:
+        if len(samples) == 1:
+            p50 = p95 = samples[0]
+        else:
+            cuts = statistics.quantiles(samples, n=20)
+            p50, p95 = cuts[9], cuts[18]
+        return {
+            "count": len(samples),
+            "mean": statistics.fmean(samples),
+            "p50": p50,
+            "p95": p95,
+            "max": max(samples),
+        }
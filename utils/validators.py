@@ -1,19 +1,35 @@
 # utils/validators.py
+from numbers import Real
 from typing import Dict, List
 
+from utils.models import Document, Task, SearchResult
+
+# Required key sets, computed once at import instead of per call
+_DOCUMENT_KEYS = frozenset(Document.__required_keys__)
+_TASK_KEYS = frozenset(Task.__required_keys__)
+_SEARCH_RESULT_KEYS = frozenset(SearchResult.__required_keys__)
+
 class Validator:
     """Shared validation interface"""
     @staticmethod
     def validate_document(document: Dict) -> bool:
         """Validate document structure"""
-        pass
+        return (isinstance(document, dict)
+                and _DOCUMENT_KEYS <= document.keys()
+                and isinstance(document["content"], str))
 
     @staticmethod
     def validate_task(task: Dict) -> bool:
         """Validate task structure"""
-        pass
+        return (isinstance(task, dict)
+                and _TASK_KEYS <= task.keys()
+                and isinstance(task["description"], str)
+                and isinstance(task["dependencies"], list))
 
     @staticmethod
     def validate_search_result(result: Dict) -> bool:
         """Validate search result structure"""
-        pass
\ No newline at end of file
+        return (isinstance(result, dict)
+                and _SEARCH_RESULT_KEYS <= result.keys()
+                and isinstance(result["score"], Real)
+                and Validator.validate_document(result["document"]))